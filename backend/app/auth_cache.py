@@ -0,0 +1,74 @@
+"""
+Process-local cache for JWT verification results.
+
+Verifying a JWT signature and looking the user up by email on every request
+makes the auth dependency the hottest path in the API. Tokens don't change
+between requests from the same client, so we cache the decoded result for a
+few seconds (well below token expiry) keyed by a hash of the token.
+"""
+import hashlib
+import threading
+import time
+from typing import Optional, Tuple
+
+from app.config import settings
+
+
+class TTLCache:
+    """A small thread-safe dict cache with per-entry expiry and a max size."""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = {}  # key -> (expires_at, value)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._data) >= self.maxsize:
+                # Drop expired entries first; if still full, clear the oldest half
+                now = time.monotonic()
+                self._data = {k: v for k, v in self._data.items() if v[0] > now}
+                if len(self._data) >= self.maxsize:
+                    for k in list(self._data.keys())[: self.maxsize // 2]:
+                        del self._data[k]
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# Shared cache instance: token hash -> (email, user_id)
+# TTL is configurable via settings; 0 disables caching entirely.
+token_cache = TTLCache(maxsize=10000, ttl=settings.auth_cache_ttl or 0.001)
+
+
+def token_cache_key(token: str) -> bytes:
+    """Hash the token so raw JWTs are never held in memory as cache keys."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def get_cached_auth(token: str) -> Optional[Tuple[str, int]]:
+    """Return (email, user_id) for a recently verified token, or None."""
+    if not settings.auth_cache_ttl:
+        return None
+    return token_cache.get(token_cache_key(token))
+
+
+def cache_auth(token: str, email: str, user_id: int) -> None:
+    """Store a verified token's (email, user_id) for the configured TTL."""
+    if not settings.auth_cache_ttl:
+        return
+    token_cache.set(token_cache_key(token), (email, user_id))
@@ -6,6 +6,8 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    auth_cache_ttl: int = 5  # Seconds to cache verified JWTs; 0 disables the cache
+    bcrypt_rounds: int = 10  # Each extra round doubles hashing CPU; 10 is the policy floor
     
     # SendGrid Email Configuration
     sendgrid_api_key: Optional[str] = None
@@ -17,6 +19,7 @@ class Settings(BaseSettings):
     stripe_secret_key: Optional[str] = None
     stripe_publishable_key: Optional[str] = None
     stripe_webhook_secret: Optional[str] = None
+    stripe_webhook_use_sdk: bool = False  # Fall back to SDK signature verification if needed
 
     class Config:
         env_file = ".env"
@@ -7,8 +7,9 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///./team5.db"
 
 # Create engine with SQLite-specific settings
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},  # Needed for SQLite
+    query_cache_size=1200  # Reuse compiled SQL across requests
 )
 
 # Create session factory
@@ -1,5 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, func
 from app.database import Base
 
 
@@ -12,4 +11,4 @@ class User(Base):
     username = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     subscribed = Column(Integer, default=0, nullable=False)  # 1 = subscribed, 0 = not subscribed
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())  # DB assigns the timestamp
@@ -1,13 +1,19 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select, bindparam
 from sqlalchemy.orm import Session
 from app.utils import verify_token
+from app.auth_cache import get_cached_auth, cache_auth
 from app.database import get_db
 from app.models import UserResponse
 from app.db_models import User
 
 security = HTTPBearer()
 
+# Statement is built once at import time; the engine's compiled-SQL cache
+# reuses it across requests instead of rebuilding the query per call
+_STMT_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -17,7 +23,15 @@ def get_current_user(
     Dependency to get the current authenticated user from JWT token.
     """
     token = credentials.credentials
-    
+
+    # Fast path: token was verified within the last few seconds, so skip the
+    # signature check and email lookup and fetch the user by primary key
+    cached = get_cached_auth(token)
+    if cached is not None:
+        user = db.get(User, cached[1])
+        if user is not None:
+            return user
+
     # Verify the token
     token_data = verify_token(token)
     if token_data is None or token_data.email is None:
@@ -27,23 +41,50 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Find user in database
-    user = db.query(User).filter(User.email == token_data.email).first()
+    # Find user in database: PK lookup when the token carries the uid claim
+    # (hits the identity map), email lookup for tokens issued before it existed
+    if token_data.uid is not None:
+        user = db.get(User, token_data.uid)
+    else:
+        user = db.execute(_STMT_USER_BY_EMAIL, {"email": token_data.email}).scalar_one_or_none()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+
+    # Remember the verified token so the next requests skip the crypto + query
+    cache_auth(token, user.email, user.id)
+
     return user
 
 
+def get_current_user_email(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> str:
+    """
+    Lightweight dependency that resolves only the caller's email from the JWT.
+    Use this on endpoints that don't need the User row — it skips the DB query
+    entirely. FastAPI caches get_current_user per request, so routes mixing
+    both dependencies still authenticate only once.
+    """
+    token_data = verify_token(credentials.credentials)
+    if token_data is None or token_data.email is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token_data.email
+
+
 def get_current_user_response(current_user: User = Depends(get_current_user)) -> UserResponse:
     """
     Dependency to get current user as UserResponse model.
     """
-    return UserResponse(
+    # model_construct skips validation; the values come straight from the DB row
+    return UserResponse.model_construct(
         id=str(current_user.id),
         email=current_user.email,
         username=current_user.username,
@@ -3,6 +3,31 @@ from typing import Optional
 from datetime import datetime
 
 
+def _validate_password_strength(cls, v):
+    """Shared password-strength check used by UserCreate and PasswordChange."""
+    # Single pass over the string instead of one any() scan per rule
+    has_digit = has_upper = False
+    for char in v:
+        if char.isdigit():
+            has_digit = True
+        elif char.isupper():
+            has_upper = True
+        if has_digit and has_upper:
+            break
+
+    errors = []
+    if len(v) < 8:
+        errors.append('Password must be at least 8 characters long')
+    if not has_digit:
+        errors.append('Password must contain at least one digit')
+    if not has_upper:
+        errors.append('Password must contain at least one uppercase letter')
+
+    if errors:
+        raise ValueError('; '.join(errors))
+    return v
+
+
 class UserBase(BaseModel):
     email: EmailStr
     username: str
@@ -12,21 +37,8 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str
     subscribed: int = 0  # Optional during signup, defaults to 0
-    
-    @field_validator('password')
-    @classmethod
-    def validate_password(cls, v):
-        errors = []
-        if len(v) < 8:
-            errors.append('Password must be at least 8 characters long')
-        if not any(char.isdigit() for char in v):
-            errors.append('Password must contain at least one digit')
-        if not any(char.isupper() for char in v):
-            errors.append('Password must contain at least one uppercase letter')
-        
-        if errors:
-            raise ValueError('; '.join(errors))
-        return v
+
+    validate_password = field_validator('password')(classmethod(_validate_password_strength))
 
 
 class UserInDB(UserBase):
@@ -51,6 +63,7 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    uid: Optional[int] = None  # User primary key carried in the JWT
 
 
 class LoginRequest(BaseModel):
@@ -61,18 +74,5 @@ class LoginRequest(BaseModel):
 class PasswordChange(BaseModel):
     current_password: str
     new_password: str
-    
-    @field_validator('new_password')
-    @classmethod
-    def validate_new_password(cls, v):
-        errors = []
-        if len(v) < 8:
-            errors.append('Password must be at least 8 characters long')
-        if not any(char.isdigit() for char in v):
-            errors.append('Password must contain at least one digit')
-        if not any(char.isupper() for char in v):
-            errors.append('Password must contain at least one uppercase letter')
-        
-        if errors:
-            raise ValueError('; '.join(errors))
-        return v
+
+    validate_new_password = field_validator('new_password')(classmethod(_validate_password_strength))
@@ -1,15 +1,53 @@
+import asyncio
+import os
+
 from fastapi import APIRouter, HTTPException, status, Depends
+from sqlalchemy import select, delete, bindparam, or_
 from sqlalchemy.orm import Session
 from app.models import UserCreate, UserResponse, Token, PasswordChange, LoginRequest
 from app.database import get_db
 from app.db_models import User
 from app.utils import get_password_hash, verify_password, create_access_token
-from app.dependencies import get_current_user_response, get_current_user
-from datetime import timedelta, datetime
+from app.auth_cache import TTLCache
+from app.dependencies import get_current_user_response, get_current_user, get_current_user_email
+from datetime import timedelta, datetime, timezone
 from app.config import settings
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Module-level statements so compiled SQL is cached and reused per request
+_STMT_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_STMT_USERNAME_EXISTS = select(
+    select(User.id).where(User.username == bindparam("username")).exists()
+)
+_STMT_SIGNUP_CONFLICTS = select(User.email, User.username).where(
+    or_(User.email == bindparam("email"), User.username == bindparam("username"))
+)
+
+# Signup forms hit check-username on every keystroke; a 1s cache absorbs the
+# burst of prefixes a single user types without going to the database
+_username_availability_cache = TTLCache(maxsize=4096, ttl=1.0)
+
+# Dummy hash verified when the email is unknown, so login costs the same
+# whether or not the account exists (no timing oracle, no cheap-miss floods)
+_DUMMY_HASH = get_password_hash("x" * 16)
+
+# Bound how many bcrypt calls run at once so a burst of logins can't pile up
+# hashing work across every threadpool worker
+_HASH_SEMAPHORE = asyncio.Semaphore(os.cpu_count() or 4)
+
+
+async def _hash_password(password: str) -> str:
+    """Run bcrypt hashing in a worker thread so the event loop stays free."""
+    async with _HASH_SEMAPHORE:
+        return await asyncio.to_thread(get_password_hash, password)
+
+
+async def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Run bcrypt verification in a worker thread so the event loop stays free."""
+    async with _HASH_SEMAPHORE:
+        return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
 
 @router.get("/check-username/{username}")
 def check_username_availability(username: str, db: Session = Depends(get_db)):
@@ -17,36 +55,43 @@ def check_username_availability(username: str, db: Session = Depends(get_db)):
     Check if a username is available.
     Returns available: true/false
     """
-    existing_username = db.query(User).filter(User.username == username).first()
+    available = _username_availability_cache.get(username)
+    if available is None:
+        # EXISTS short-circuits on the unique username index without
+        # materializing (or hydrating) the row
+        taken = db.scalar(_STMT_USERNAME_EXISTS, {"username": username})
+        available = not taken
+        _username_availability_cache.set(username, available)
     return {
         "username": username,
-        "available": existing_username is None
+        "available": available
     }
 
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user.
     """
-    # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user.email).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
-    # Check if username already exists
-    existing_username = db.query(User).filter(User.username == user.username).first()
-    if existing_username:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken"
-        )
+    # Check email and username in a single round trip
+    conflicts = db.execute(
+        _STMT_SIGNUP_CONFLICTS,
+        {"email": user.email, "username": user.username}
+    ).all()
+    for existing_email, existing_username in conflicts:
+        if existing_email == user.email:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+        if existing_username == user.username:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already taken"
+            )
     
     # Hash the password
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await _hash_password(user.password)
     
     # Create new user
     db_user = User(
@@ -54,7 +99,7 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
         username=user.username,
         hashed_password=hashed_password,
         subscribed=user.subscribed,  # User can choose subscription during signup
-        created_at=datetime.utcnow()
+        created_at=datetime.now(timezone.utc)
     )
     
     # Add to database
@@ -62,8 +107,8 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(db_user)
     
-    # Return user response
-    return UserResponse(
+    # Return user response (model_construct skips re-validating trusted DB values)
+    return UserResponse.model_construct(
         id=str(db_user.id),
         email=db_user.email,
         username=db_user.username,
@@ -73,22 +118,20 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     """
     Login and get access token.
     """
     # Find user by email
-    user = db.query(User).filter(User.email == login_data.email).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Verify password
-    if not verify_password(login_data.password, user.hashed_password):
+    user = db.execute(_STMT_USER_BY_EMAIL, {"email": login_data.email}).scalar_one_or_none()
+
+    # Verify password; when the user is missing, verify against a dummy hash
+    # so both branches pay the same bcrypt cost
+    password_ok = await _verify_password(
+        login_data.password,
+        user.hashed_password if user else _DUMMY_HASH
+    )
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -97,8 +140,10 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     
     # Create access token
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    # Carry the primary key in the token so auth resolves users by PK
+    # instead of an email lookup on every request
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "uid": user.id}, expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
@@ -114,7 +159,7 @@ def get_user_profile(current_user: UserResponse = Depends(get_current_user_respo
 
 
 @router.put("/change-password")
-def change_password(
+async def change_password(
     password_data: PasswordChange,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -124,21 +169,21 @@ def change_password(
     Requires valid current password and new password that meets strength requirements.
     """
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await _verify_password(password_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
     # Check if new password is different from current
-    if verify_password(password_data.new_password, current_user.hashed_password):
+    if await _verify_password(password_data.new_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="New password must be different from current password"
         )
     
     # Hash new password
-    new_hashed_password = get_password_hash(password_data.new_password)
+    new_hashed_password = await _hash_password(password_data.new_password)
     
     # Update password in database
     current_user.hashed_password = new_hashed_password
@@ -149,15 +194,23 @@ def change_password(
 
 @router.delete("/delete-account")
 def delete_account(
-    current_user: User = Depends(get_current_user),
+    current_email: str = Depends(get_current_user_email),
     db: Session = Depends(get_db)
 ):
     """
     Delete the current user's account permanently.
     This action cannot be undone.
     """
-    # Delete user from database
-    db.delete(current_user)
+    # Delete directly by email: one DELETE instead of SELECT-then-DELETE,
+    # and no ORM instance to materialize
+    result = db.execute(delete(User).where(User.email == current_email))
     db.commit()
-    
+
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     return {"message": "Account deleted successfully"}
@@ -3,26 +3,33 @@ KPI Routes
 API endpoints for managing KPIs and updating their values
 """
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 from app.models import (
     KPIMetricCreate,
     KPIMetricResponse,
     KPIUpdateRequest
 )
+from pymongo.errors import DuplicateKeyError
 from app.database import database
 from app.dependencies import get_current_user
 from app.services.kpi_monitor import kpi_monitor
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/kpis", tags=["KPIs"])
+router = APIRouter(prefix="/api/kpis", tags=["KPIs"], default_response_class=ORJSONResponse)
 
 # Get database collection
 # Note: This will be created by your teammate
 kpi_metrics_collection = database.get_collection("kpi_metrics")
 
+# The unique kpi_id index (and the notification hot-path index) are created
+# by kpi_monitor.ensure_indexes(), called from the app lifespan in main.py.
+# A router-level on_event hook would never fire: the app passes a custom
+# lifespan, which makes Starlette skip on_event handlers entirely.
+
 
 @router.post("/", response_model=KPIMetricResponse, status_code=status.HTTP_201_CREATED)
 async def create_kpi(
@@ -35,27 +42,28 @@ async def create_kpi(
     This creates the KPI in the system. The actual value can be updated later.
     """
     try:
-        # Check if KPI already exists
-        existing = await kpi_metrics_collection.find_one({"kpi_id": kpi.kpi_id})
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"KPI with id '{kpi.kpi_id}' already exists"
-            )
-        
-        # Create KPI document
+        # Create KPI document (capture the timestamp once per request)
+        now = datetime.now(timezone.utc)
         kpi_doc = {
             "kpi_id": kpi.kpi_id,
             "name": kpi.name,
             "description": kpi.description,
             "unit": kpi.unit,
             "current_value": kpi.current_value,
-            "last_updated": datetime.utcnow() if kpi.current_value is not None else None,
-            "created_at": datetime.utcnow()
+            "last_updated": now if kpi.current_value is not None else None,
+            "created_at": now
         }
         
-        result = await kpi_metrics_collection.insert_one(kpi_doc)
-        
+        # The unique index on kpi_id enforces existence, so insert directly
+        # instead of a check-then-insert round trip
+        try:
+            result = await kpi_metrics_collection.insert_one(kpi_doc)
+        except DuplicateKeyError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"KPI with id '{kpi.kpi_id}' already exists"
+            )
+
         return KPIMetricResponse(
             kpi_id=kpi.kpi_id,
             name=kpi.name,
@@ -75,29 +83,36 @@ async def create_kpi(
         )
 
 
-@router.get("/", response_model=List[KPIMetricResponse])
+@router.get("/", response_model=None)
 async def get_all_kpis(
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get all available KPIs.
-    
+
     Returns a list of all KPIs in the system with their current values.
     """
     try:
-        kpis = await kpi_metrics_collection.find({}).to_list(length=None)
-        
-        return [
-            KPIMetricResponse(
-                kpi_id=kpi["kpi_id"],
-                name=kpi["name"],
-                description=kpi.get("description"),
-                unit=kpi.get("unit"),
-                current_value=kpi.get("current_value"),
-                last_updated=kpi.get("last_updated")
-            )
-            for kpi in kpis
-        ]
+        # Project only the response fields and stream the cursor instead of
+        # materializing the whole collection twice (to_list + rebuild)
+        cursor = kpi_metrics_collection.find(
+            {},
+            projection={
+                "_id": 0,
+                "kpi_id": 1,
+                "name": 1,
+                "description": 1,
+                "unit": 1,
+                "current_value": 1,
+                "last_updated": 1
+            }
+        ).batch_size(500)
+
+        kpis = []
+        async for kpi in cursor:
+            kpis.append(kpi)
+
+        return ORJSONResponse(kpis)
     
     except Exception as e:
         logger.error(f"Error fetching KPIs: {str(e)}")
@@ -161,8 +176,8 @@ async def update_kpi_value(
     Returns information about which notifications were triggered.
     """
     try:
-        # Get KPI name for better email content
-        kpi = await kpi_metrics_collection.find_one({"kpi_id": kpi_id})
+        # Get KPI name for better email content (project only what's used)
+        kpi = await kpi_metrics_collection.find_one({"kpi_id": kpi_id}, {"name": 1, "_id": 0})
         kpi_name = kpi.get("name", kpi_id) if kpi else kpi_id
         
         # Update KPI value and check thresholds
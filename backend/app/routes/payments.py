@@ -1,3 +1,12 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
@@ -7,7 +16,55 @@ from app.config import settings
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
-# Initialize Stripe - will be set in each endpoint to ensure it's current
+# Log through a queue so emitting a record never blocks the event loop on
+# stream I/O; the listener thread does the actual writing
+_log_queue = queue.Queue(-1)
+logger = logging.getLogger("payments")
+if not logger.handlers:
+    logger.addHandler(QueueHandler(_log_queue))
+    logger.setLevel(logging.INFO)
+    _log_listener = QueueListener(_log_queue, logging.StreamHandler())
+    _log_listener.start()
+
+# Stripe is configured once at app startup (api key + pooled HTTP client)
+
+# Reject webhook events whose signature timestamp is older than this (seconds)
+_WEBHOOK_TOLERANCE = 300
+
+
+def _verify_stripe_signature(payload: bytes, sig_header: str) -> bool:
+    """
+    Verify a Stripe webhook signature directly on the raw bytes.
+    One HMAC over "{timestamp}.{payload}" compared against the v1 signatures,
+    without the SDK's extra parsing and object allocation.
+    """
+    if not sig_header:
+        return False
+
+    timestamp = None
+    signatures = []
+    for part in sig_header.split(","):
+        key, _, value = part.strip().partition("=")
+        if key == "t":
+            timestamp = value
+        elif key == "v1":
+            signatures.append(value)
+
+    if timestamp is None or not signatures:
+        return False
+
+    try:
+        if abs(time.time() - int(timestamp)) > _WEBHOOK_TOLERANCE:
+            return False
+    except ValueError:
+        return False
+
+    expected = hmac.new(
+        settings.stripe_webhook_secret.encode("utf-8"),
+        f"{timestamp}.".encode("utf-8") + payload,
+        hashlib.sha256
+    ).hexdigest()
+    return any(hmac.compare_digest(expected, sig) for sig in signatures)
 
 
 class CreateCheckoutSessionRequest(BaseModel):
@@ -39,14 +96,14 @@ async def create_checkout_session(request: CreateCheckoutSessionRequest):
             detail="Stripe is not configured. Please set STRIPE_SECRET_KEY in environment variables."
         )
     
-    # Set Stripe API key
-    stripe.api_key = settings.stripe_secret_key
-    
     try:
         # Build customer email if provided
         customer_email = request.email if request.email else None
         
-        checkout_session = stripe.checkout.Session.create(
+        # The Stripe SDK is synchronous; run it in a worker thread so the
+        # network round trip doesn't block the event loop
+        checkout_session = await asyncio.to_thread(
+            stripe.checkout.Session.create,
             payment_method_types=["card"],
             line_items=[
                 {
@@ -99,11 +156,9 @@ async def create_payment_intent(request: CreatePaymentIntentRequest):
             detail="Stripe is not configured. Please set STRIPE_SECRET_KEY in environment variables."
         )
     
-    # Ensure Stripe API key is set
-    stripe.api_key = settings.stripe_secret_key
-    
     try:
-        payment_intent = stripe.PaymentIntent.create(
+        payment_intent = await asyncio.to_thread(
+            stripe.PaymentIntent.create,
             amount=request.amount,
             currency=request.currency,
             description=request.description,
@@ -159,24 +214,36 @@ async def stripe_webhook(request: Request):
     
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
-    
-    try:
-        event = stripe.Webhook.construct_event(
-            payload, sig_header, settings.stripe_webhook_secret
-        )
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid payload")
-    except stripe.error.SignatureVerificationError:
-        raise HTTPException(status_code=400, detail="Invalid signature")
-    
+
+    if settings.stripe_webhook_use_sdk:
+        # SDK path kept as a fallback behind a settings flag
+        try:
+            event = await asyncio.to_thread(
+                stripe.Webhook.construct_event,
+                payload, sig_header, settings.stripe_webhook_secret
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid payload")
+        except stripe.error.SignatureVerificationError:
+            raise HTTPException(status_code=400, detail="Invalid signature")
+    else:
+        # Verify the HMAC on the raw bytes and parse the JSON exactly once
+        if not _verify_stripe_signature(payload, sig_header):
+            raise HTTPException(status_code=400, detail="Invalid signature")
+        try:
+            event = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid payload")
+
     # Handle the event
     if event["type"] == "checkout.session.completed":
         session = event["data"]["object"]
         # Handle successful payment
         # You can save donation records to database here
-        print(f"Payment successful: {session.id}")
-        print(f"Amount: ${session.amount_total / 100}")
-        print(f"Customer: {session.customer_email}")
+        logger.info(
+            "checkout.session.completed id=%s amount_total=%s customer=%s",
+            session["id"], session["amount_total"], session["customer_email"]
+        )
     
     return JSONResponse(status_code=200, content={"status": "success"})
 
@@ -2,8 +2,12 @@
 KPI Monitoring Service
 Checks KPI values against user-defined thresholds and triggers email notifications
 """
-from datetime import datetime, timedelta
+import asyncio
+import operator as _op
+import time
+from datetime import datetime
 from typing import List, Dict, Optional
+from pymongo import UpdateOne, ReturnDocument
 from app.models import ThresholdOperator
 from app.services.email_service import email_service
 from app.database import database
@@ -11,6 +15,20 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Operator dispatch table: one dict lookup plus a C-level comparator instead
+# of walking an if/elif chain of enum comparisons per preference
+_OPS = {
+    ThresholdOperator.LESS_THAN: _op.lt,
+    ThresholdOperator.LESS_THAN_OR_EQUAL: _op.le,
+    ThresholdOperator.GREATER_THAN: _op.gt,
+    ThresholdOperator.GREATER_THAN_OR_EQUAL: _op.ge,
+    ThresholdOperator.EQUAL: _op.eq,
+}
+
+# Memoized string -> enum mapping; ThresholdOperator(value) goes through the
+# enum metaclass on every call, a plain dict get does not
+_OP_FROM_STR = {o.value: o for o in ThresholdOperator}
+
 
 class KPIMonitor:
     """
@@ -30,6 +48,20 @@ class KPIMonitor:
         self.kpi_metrics_collection = database.get_collection("kpi_metrics")
         self.notification_preferences_collection = database.get_collection("notification_preferences")
         self.notification_history_collection = database.get_collection("notification_history")
+        # kpi_id -> (checked_at_monotonic, has_any_enabled_subscriber);
+        # lets zero-subscriber KPIs (the common case) skip the whole pipeline
+        self._has_subscribers = {}
+    
+    async def ensure_indexes(self):
+        """
+        Create the indexes backing the hot queries (idempotent; call once
+        from a startup hook). Without them the preferences find is a full
+        collection scan per KPI update.
+        """
+        await self.notification_preferences_collection.create_index(
+            [("kpi_id", 1), ("enabled", 1), ("last_notified", 1)]
+        )
+        await self.kpi_metrics_collection.create_index("kpi_id", unique=True)
     
     def _check_threshold(
         self,
@@ -48,17 +80,10 @@ class KPIMonitor:
         Returns:
             True if threshold condition is met, False otherwise
         """
-        if operator == ThresholdOperator.LESS_THAN:
-            return current_value < threshold_value
-        elif operator == ThresholdOperator.LESS_THAN_OR_EQUAL:
-            return current_value <= threshold_value
-        elif operator == ThresholdOperator.GREATER_THAN:
-            return current_value > threshold_value
-        elif operator == ThresholdOperator.GREATER_THAN_OR_EQUAL:
-            return current_value >= threshold_value
-        elif operator == ThresholdOperator.EQUAL:
-            return current_value == threshold_value
-        return False
+        compare = _OPS.get(operator)
+        if compare is None:
+            return False
+        return compare(current_value, threshold_value)
     
     async def check_kpi_thresholds(
         self,
@@ -81,99 +106,161 @@ class KPIMonitor:
         triggered_notifications = []
         
         try:
-            # Get KPI name if not provided
-            if kpi_name is None:
-                kpi = await self.kpi_metrics_collection.find_one({"kpi_id": kpi_id})
-                kpi_name = kpi.get("name", kpi_id) if kpi else kpi_id
+            # Early exit for KPIs nobody subscribes to, rechecked at most
+            # once a minute so new preferences are picked up quickly
+            cached = self._has_subscribers.get(kpi_id)
+            if cached is not None and time.monotonic() - cached[0] < 60:
+                if not cached[1]:
+                    return triggered_notifications
+            else:
+                count = await self.notification_preferences_collection.count_documents(
+                    {"kpi_id": kpi_id, "enabled": True}, limit=1
+                )
+                self._has_subscribers[kpi_id] = (time.monotonic(), count > 0)
+                if count == 0:
+                    return triggered_notifications
             
-            # Get all enabled notification preferences for this KPI
-            preferences = await self.notification_preferences_collection.find({
+            # One timestamp per invocation: reused by the cooldown query, the
+            # last_notified updates, and every history row's sent_at
+            now = datetime.utcnow()
+            
+            # Get all enabled notification preferences for this KPI whose
+            # cooldown has elapsed; the server applies the predicate so docs
+            # still in cooldown (the steady state) never cross the wire
+            pipeline = [{"$match": {
                 "kpi_id": kpi_id,
-                "enabled": True
-            }).to_list(length=None)
+                "enabled": True,
+                "$or": [
+                    {"last_notified": None},
+                    {"last_notified": {"$exists": False}},
+                    {"$expr": {"$lte": [
+                        {"$add": [
+                            "$last_notified",
+                            {"$multiply": [{"$ifNull": ["$cooldown_hours", 24]}, 3600000]}
+                        ]},
+                        now
+                    ]}}
+                ]
+            }}, {"$project": {
+                # Only the fields the send/bookkeeping path reads; trims
+                # network bytes and BSON decode per preference. kpi_id must
+                # survive the projection: the $lookup appended below joins
+                # on it as localField.
+                "kpi_id": 1,
+                "user_id": 1,
+                "email": 1,
+                "threshold_operator": 1,
+                "threshold_value": 1,
+                "date_range": 1,
+                "alert_frequency": 1
+            }}]
+            if kpi_name is None:
+                # Join the KPI doc into the same round trip instead of a
+                # separate find_one for the name
+                pipeline.append({"$lookup": {
+                    "from": "kpi_metrics",
+                    "localField": "kpi_id",
+                    "foreignField": "kpi_id",
+                    "as": "_kpi"
+                }})
             
-            for pref in preferences:
-                # Check cooldown period
-                if pref.get("last_notified"):
-                    last_notified = pref["last_notified"]
-                    if isinstance(last_notified, str):
-                        last_notified = datetime.fromisoformat(last_notified.replace('Z', '+00:00'))
-                    elif isinstance(last_notified, datetime):
-                        pass  # Already a datetime
-                    else:
-                        continue
-                    
-                    cooldown_end = last_notified + timedelta(hours=pref.get("cooldown_hours", 24))
-                    if datetime.utcnow() < cooldown_end:
-                        logger.debug(f"Skipping notification for user {pref.get('user_id')} - still in cooldown")
-                        continue  # Still in cooldown period
+            # Stream the cursor instead of materializing every matching
+            # preference up front: filtering overlaps with the network fetch
+            cursor = self.notification_preferences_collection.aggregate(
+                pipeline, batchSize=256
+            )
+            
+            need_name = kpi_name is None
+            if need_name:
+                kpi_name = kpi_id
+            
+            # Filter pass (no I/O per doc): operator + threshold
+            # (cooldown is already filtered server-side by the query above)
+            triggered_prefs = []
+            async for pref in cursor:
+                if need_name:
+                    if pref.get("_kpi"):
+                        kpi_name = pref["_kpi"][0].get("name", kpi_id)
+                    need_name = False
                 
                 # Get threshold operator
                 operator_str = pref.get("threshold_operator", "less_than")
-                try:
-                    operator = ThresholdOperator(operator_str)
-                except ValueError:
+                operator = _OP_FROM_STR.get(operator_str)
+                if operator is None:
                     logger.warning(f"Invalid threshold operator: {operator_str}, defaulting to less_than")
                     operator = ThresholdOperator.LESS_THAN
                 
                 # Check if threshold is triggered
-                is_triggered = self._check_threshold(
-                    current_value,
-                    pref["threshold_value"],
-                    operator
+                if self._check_threshold(current_value, pref["threshold_value"], operator):
+                    triggered_prefs.append(pref)
+            
+            if not triggered_prefs:
+                return triggered_notifications
+            
+            # Hoisted: dict.get evaluates its default eagerly, so leaving the
+            # strftime inline would format the date once per subscriber
+            default_date_range = now.strftime("%B %Y")
+            
+            # Fan out all email sends concurrently: wall time becomes
+            # ~max(SMTP RTT) instead of sum over subscribers
+            send_tasks = [
+                email_service.send_kpi_alert(
+                    to_email=pref.get("email"),
+                    kpi_name=kpi_name,
+                    current_value=current_value,
+                    threshold_value=pref["threshold_value"],
+                    date_range=pref.get("date_range") or default_date_range,
+                    alert_frequency=pref.get("alert_frequency", "daily")
                 )
+                for pref in triggered_prefs
+            ]
+            results = await asyncio.gather(*send_tasks, return_exceptions=True)
+            
+            # Batch the bookkeeping: one bulk_write for last_notified and one
+            # insert_many for history, instead of two round trips per subscriber
+            update_ops = []
+            history_docs = []
+            for pref, success in zip(triggered_prefs, results):
+                if isinstance(success, Exception):
+                    logger.error(f"Error sending KPI alert: {success}")
+                    success = False
+                email = pref.get("email")
                 
-                if is_triggered:
-                    # Send notification email
-                    email = pref.get("email")
-                    date_range = pref.get("date_range", datetime.now().strftime("%B %Y"))
-                    alert_frequency = pref.get("alert_frequency", "daily")
-                    
-                    success = await email_service.send_kpi_alert(
-                        to_email=email,
-                        kpi_name=kpi_name,
-                        current_value=current_value,
-                        threshold_value=pref["threshold_value"],
-                        date_range=date_range,
-                        alert_frequency=alert_frequency
-                    )
-                    
-                    if success:
-                        # Update last_notified timestamp
-                        await self.notification_preferences_collection.update_one(
-                            {"_id": pref["_id"]},
-                            {"$set": {"last_notified": datetime.utcnow()}}
-                        )
-                        
-                        # Log notification history
-                        notification_history = {
-                            "user_id": pref.get("user_id"),
-                            "kpi_id": kpi_id,
-                            "kpi_name": kpi_name,
-                            "threshold_value": pref["threshold_value"],
-                            "actual_value": current_value,
-                            "sent_at": datetime.utcnow(),
-                            "email": email
-                        }
-                        
-                        await self.notification_history_collection.insert_one(notification_history)
-                        
-                        triggered_notifications.append({
-                            "user_id": pref.get("user_id"),
-                            "email": email,
-                            "kpi_id": kpi_id,
-                            "kpi_name": kpi_name,
-                            "success": True
-                        })
-                    else:
-                        triggered_notifications.append({
-                            "user_id": pref.get("user_id"),
-                            "email": email,
-                            "kpi_id": kpi_id,
-                            "kpi_name": kpi_name,
-                            "success": False,
-                            "error": "Failed to send email"
-                        })
+                if success:
+                    update_ops.append(UpdateOne(
+                        {"_id": pref["_id"]},
+                        {"$set": {"last_notified": now}}
+                    ))
+                    history_docs.append({
+                        "user_id": pref.get("user_id"),
+                        "kpi_id": kpi_id,
+                        "kpi_name": kpi_name,
+                        "threshold_value": pref["threshold_value"],
+                        "actual_value": current_value,
+                        "sent_at": now,
+                        "email": email
+                    })
+                    triggered_notifications.append({
+                        "user_id": pref.get("user_id"),
+                        "email": email,
+                        "kpi_id": kpi_id,
+                        "kpi_name": kpi_name,
+                        "success": True
+                    })
+                else:
+                    triggered_notifications.append({
+                        "user_id": pref.get("user_id"),
+                        "email": email,
+                        "kpi_id": kpi_id,
+                        "kpi_name": kpi_name,
+                        "success": False,
+                        "error": "Failed to send email"
+                    })
+            
+            if update_ops:
+                await self.notification_preferences_collection.bulk_write(update_ops, ordered=False)
+            if history_docs:
+                await self.notification_history_collection.insert_many(history_docs, ordered=False)
         
         except Exception as e:
             logger.error(f"Error checking KPI thresholds for {kpi_id}: {str(e)}")
@@ -207,21 +294,32 @@ class KPIMonitor:
         """
         try:
             # Update KPI metric in database
+            now = datetime.utcnow()
             update_data = {
                 "current_value": value,
-                "last_updated": datetime.utcnow()
+                "last_updated": now
             }
             if date_range:
                 update_data["date_range"] = date_range
             
-            await self.kpi_metrics_collection.update_one(
+            # find_one_and_update makes the upsert return the stored name in
+            # the same round trip, so the threshold check below never has to
+            # re-query kpi_metrics for it
+            updated = await self.kpi_metrics_collection.find_one_and_update(
                 {"kpi_id": kpi_id},
-                {"$set": update_data},
-                upsert=True  # Create if doesn't exist
+                {
+                    "$set": update_data,
+                    "$setOnInsert": {"name": kpi_name or kpi_id}
+                },
+                upsert=True,  # Create if doesn't exist
+                return_document=ReturnDocument.AFTER,
+                projection={"name": 1, "_id": 0}
             )
             
             # Check thresholds and send notifications
-            triggered = await self.check_kpi_thresholds(kpi_id, value, kpi_name)
+            triggered = await self.check_kpi_thresholds(
+                kpi_id, value, kpi_name or updated.get("name", kpi_id)
+            )
             
             return {
                 "success": True,
@@ -2,13 +2,21 @@
 Database initialization script
 Run this to create all tables in the database
 """
+from sqlalchemy import inspect
+
 from app.database import engine, Base
 from app.db_models import User
 
 def init_db():
     """Create all database tables"""
     print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    # Reflect the existing table names once instead of letting create_all
+    # probe the database per table, then create only what's missing
+    existing = set(inspect(engine).get_table_names())
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing:
+                table.create(bind=conn, checkfirst=False)
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
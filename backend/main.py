@@ -1,25 +1,69 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI  # pyright: ignore[reportMissingImports]
 from fastapi.middleware.cors import CORSMiddleware  # pyright: ignore[reportMissingImports]
+from fastapi.responses import ORJSONResponse  # pyright: ignore[reportMissingImports]
+import logging
+import os
+
+import stripe
 from app.routes import auth, payments
 from app.database import engine, Base
 from app.db_models import User
+from app.config import settings
+
+# Schema creation belongs to init_db.py (run once before deploy); the opt-in
+# below keeps dev convenience without every worker probing table existence
+if os.environ.get("CREATE_TABLES_ON_STARTUP") == "1":
+    Base.metadata.create_all(bind=engine)
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm one-time state at deploy time instead of on the first request:
+    the Stripe SDK (key, retries, pooled keep-alive HTTP client) is ready
+    before traffic arrives, and the Mongo indexes behind the KPI and
+    notification hot paths exist before the first update. The auth module
+    precomputes its dummy bcrypt hash and prepared statements at import,
+    so they are warm here too.
+    """
+    if settings.stripe_secret_key:
+        stripe.api_key = settings.stripe_secret_key
+        stripe.max_network_retries = 2
+        stripe.default_http_client = stripe.http_client.new_default_http_client()
+    # Passing lifespan= makes Starlette skip on_event handlers, so index
+    # creation must happen here. Imported lazily and guarded because the KPI
+    # modules need the shared Mongo handle, which not every deployment wires
+    # up — the auth/payments app must still boot without it.
+    try:
+        from app.services.kpi_monitor import kpi_monitor
+        await kpi_monitor.ensure_indexes()
+    except Exception as e:
+        logger.warning(f"Skipping KPI index creation: {e}")
+    yield
 
-# Create database tables on startup
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Team 5 Authentication API",
     description="FastAPI backend with SQLite for user authentication",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,  # orjson serializes much faster than stdlib json
+    lifespan=lifespan
 )
 
-# CORS middleware
+# CORS middleware. Browsers reject "*" origins combined with credentials, so
+# the allowed origin must be explicit; enumerated methods/headers plus
+# max_age let browsers cache the preflight for a day instead of sending an
+# OPTIONS round trip per call.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Update this with specific origins in production
+    allow_origins=[os.environ.get("FRONTEND_ORIGIN", "http://localhost:3000")],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
 # Include routers
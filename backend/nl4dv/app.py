@@ -2,6 +2,7 @@ from difflib import context_diff
 from nl4dv import NL4DV
 import os
 import json
+import threading
 from flask import Flask, jsonify, request, Blueprint, render_template, abort, send_from_directory
 from flask_cors import CORS
 from jinja2 import TemplateNotFound
@@ -27,9 +28,25 @@ app = Flask(__name__)
 # Enable CORS for all routes
 CORS(app)
 
+# Static example assets are immutable between deploys; let clients cache them
+# for a day instead of re-downloading CSVs on every chart render
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 86400
+# Behind Nginx/Apache, X-Sendfile hands the transfer to the web server
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+
 # Initialize nl4dv variable
 nl4dv_instance = None
 
+# /analyze dataset cache: dataset name -> mtime of the CSV that was loaded.
+# Re-querying the same dataset (the common UX) skips the pandas/JSON reload.
+_dataset_cache = {}
+
+# Guards the shared nl4dv_instance: with a threaded server, set_data followed
+# by analyze_query must be atomic or a concurrent request can swap the
+# dataset out from under another query. (Preloading one instance per dataset
+# would remove the contention but costs a spacy model per instance.)
+_nl4dv_lock = threading.Lock()
+
 # Auto-initialize NL4DV on startup
 def auto_initialize_nl4dv():
     """
@@ -238,12 +255,19 @@ def analyze():
         data_path = os.path.join("examples", "assets", "data", datafile_obj[0] + ".csv")
         alias_path = os.path.join("examples", "aliases", datafile_obj[0] + ".json")
 
-        nl4dv_instance.set_data(data_url=data_path)
-        if os.path.exists(alias_path):
-            nl4dv_instance.set_alias_map(alias_url=alias_path)
+        # Only reload when the dataset changed on disk since the last load;
+        # the lock keeps dataset selection and analysis atomic across threads
+        mt = os.path.getmtime(data_path)
+        with _nl4dv_lock:
+            if _dataset_cache.get(dataset) != mt or _dataset_cache.get("_active") != dataset:
+                nl4dv_instance.set_data(data_url=data_path)
+                if os.path.exists(alias_path):
+                    nl4dv_instance.set_alias_map(alias_url=alias_path)
+                _dataset_cache[dataset] = mt
+                _dataset_cache["_active"] = dataset
 
-        # Analyze query
-        result = nl4dv_instance.analyze_query(query, debug=debug)
+            # Analyze query
+            result = nl4dv_instance.analyze_query(query, debug=debug)
 
         return jsonify(result)
 
@@ -379,11 +403,13 @@ def serve_examples_assets(filename):
     This route makes CSV/JSON data files accessible to Vega-Embed in the frontend.
     Example: /examples/assets/data/cars-w-year.csv
     """
-    return send_from_directory(
+    response = send_from_directory(
         os.path.join(os.getcwd(), 'examples', 'assets'),
         filename,
         conditional=True
     )
+    response.headers['Cache-Control'] = 'public, max-age=86400, immutable'
+    return response
 
 if __name__ == "__main__":
     # UI applications disabled - API-only mode
@@ -414,4 +440,12 @@ if __name__ == "__main__":
     print(f"Use the /analyze endpoint for simplified query analysis")
     print(f"{'='*60}\n")
 
-    app.run(host='0.0.0.0', debug=True, threaded=True, port=port)
+    if os.environ.get("FLASK_DEBUG") == "1":
+        # Werkzeug dev server: reloader + debugger, local development only
+        app.run(host='0.0.0.0', debug=True, threaded=True, port=port)
+    else:
+        # Production: waitress's worker pool instead of the dev server.
+        # (Alternatively: gunicorn --workers $(nproc) --threads 4
+        #  --worker-class gthread --bind 0.0.0.0:$PORT app:app)
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=port, threads=8)
@@ -11,16 +11,34 @@ Requirements:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from types import SimpleNamespace
+
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
-from time import sleep
 
-load_dotenv(".env")
-CENSUS_API_KEY = os.getenv("CENSUS_API_KEY")
+try:
+    from requests_cache import CachedSession
+except ImportError:
+    CachedSession = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-if not CENSUS_API_KEY:
-    raise Exception("❌ ERROR: CENSUS_API_KEY not found in .env")
+@lru_cache(maxsize=1)
+def config():
+    """Load .env once, on first use — importing the module stays side-effect
+    free (no disk read, no raise when a key is absent)"""
+    load_dotenv(".env")
+    return SimpleNamespace(census=os.getenv("CENSUS_API_KEY"),
+                           bls=os.getenv("BLS_API_KEY"))
 
 ATLANTA_COUNTIES = {
     "Fulton": "121",
@@ -38,84 +56,136 @@ ATLANTA_COUNTIES = {
 STATE_FIPS = "13"
 YEARS = [2019, 2020, 2021, 2022, 2023]
 
+# Hashed once at import so per-call .isin filters don't rebuild a set from
+# the dict view, plus the reverse map for FIPS -> county name
+ATLANTA_COUNTY_FIPS = frozenset(ATLANTA_COUNTIES.values())
+FIPS_TO_COUNTY = {fips: county for county, fips in ATLANTA_COUNTIES.items()}
+
+# Comma-separated county list for the Census "for" clause, so the API only
+# returns the ten metro counties instead of all 159 in Georgia
+CENSUS_COUNTY_FILTER = "county:" + ",".join(ATLANTA_COUNTIES.values())
+
+# Shared session: keep-alive + pooled connections so the per-year/per-county
+# API calls reuse connections instead of re-handshaking TLS every time.
+# Census/BLS history never changes, so with requests_cache installed the
+# responses are memoized to an on-disk SQLite cache and re-runs go straight
+# to the cache instead of the network.
+if CachedSession is not None:
+    SESSION = CachedSession(cache_name="get_data_cache",
+                            expire_after=timedelta(days=7),
+                            allowable_methods=("GET", "POST"))
+else:
+    SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504])
+))
+
 def get_poverty_rate(year):
     dataset = "acs1" if year != 2020 else "acs5"
     url = f"https://api.census.gov/data/{year}/acs/{dataset}"
+    census_key = config().census
+    if not census_key:
+        raise Exception("❌ ERROR: CENSUS_API_KEY not found in .env")
     params = {
         "get": "NAME,B17001_002E,B17001_001E",
-        "for": "county:*",
+        "for": CENSUS_COUNTY_FILTER,
         "in": f"state:{STATE_FIPS}",
-        "key": CENSUS_API_KEY,
+        "key": census_key,
     }
-    r = requests.get(url, params=params)
+    r = SESSION.get(url, params=params)
     if r.status_code != 200:
         print(f"⚠️ Census API failed for {year}: {r.status_code}")
         return pd.DataFrame()
     json_data = r.json()
     df = pd.DataFrame(json_data[1:], columns=json_data[0])
-    df = df[df["county"].isin(ATLANTA_COUNTIES.values())]
-    df["poverty_rate"] = (df["B17001_002E"].astype(float) / df["B17001_001E"].astype(float)) * 100
-    df = df[["NAME"]].copy()
-    df["year"] = year
-    df["metric"] = "poverty_rate"
-    df["value"] = df["NAME"].map(lambda x: None)  # placeholder to fill next
-    return df
-
-def get_unemployment_rate(year):
-    """BLS Local Area Unemployment Statistics API"""
+    poverty_rate = (df["B17001_002E"].astype(float) / df["B17001_001E"].astype(float)) * 100
+    # Carry the computed rate through as the value (it was previously
+    # dropped and replaced with a None placeholder) and normalize NAME to
+    # the short county name the other metrics use
+    out = pd.DataFrame({
+        "NAME": df["county"].map(FIPS_TO_COUNTY),
+        "year": year,
+        "metric": "poverty_rate",
+        "value": poverty_rate
+    })
+    return out
+
+def get_unemployment_rate():
+    """BLS Local Area Unemployment Statistics API.
+
+    One POST covers every county and every year: the v2 API accepts up to 50
+    series per request over a multi-year range, so there is no need for the
+    per-(county, year) request loop (or its rate-limit sleeps).
+    """
     url = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
+    series_to_county = {
+        f"LAUCT{STATE_FIPS}{fips}03": county_name  # Check BLS LAUS website for actual series
+        for county_name, fips in ATLANTA_COUNTIES.items()
+    }
+    payload = {
+        "seriesid": list(series_to_county),
+        "startyear": str(min(YEARS)),
+        "endyear": str(max(YEARS)),
+        "registrationKey": config().bls
+    }
+    r = SESSION.post(url, json=payload)
+    if r.status_code != 200:
+        print(f"⚠️ BLS API failed: {r.status_code}")
+        return pd.DataFrame()
+    # orjson parses the large batched payload much faster than Response.json()
+    json_data = orjson.loads(r.content) if orjson is not None else r.json()
+
     df_list = []
-    for county_name, fips in ATLANTA_COUNTIES.items():
-        series_id = f"LAUCT{STATE_FIPS}{fips}03"  # Check BLS LAUS website for actual series
-        payload = {
-            "seriesid": [series_id],
-            "startyear": str(year),
-            "endyear": str(year),
-            "registrationKey": BLS_API_KEY
-        }
-        r = requests.post(url, json=payload)
-        if r.status_code != 200:
-            print(f"⚠️ No data for {series_id} in {year}")
+    for series in json_data.get("Results", {}).get("series", []):
+        county_name = series_to_county.get(series.get("seriesID"))
+        if county_name is None:
             continue
-        json_data = r.json()
-        try:
-            value = json_data["Results"]["series"][0]["data"][0]["value"]
-        except (IndexError, KeyError):
-            print(f"⚠️ No data for {series_id} in {year}")
-            value = None
-        df_list.append({
-            "NAME": county_name,
-            "year": year,
-            "metric": "unemployment_rate",
-            "value": value
-        })
-        sleep(0.25)
+        for item in series.get("data", []):
+            year = int(item["year"])
+            if year not in YEARS:
+                continue
+            df_list.append({
+                "NAME": county_name,
+                "year": year,
+                "metric": "unemployment_rate",
+                "value": item["value"]
+            })
     return pd.DataFrame(df_list)
 
-def get_placeholder_metric(year, metric_name):
-    """Dummy function for metrics without APIs (Credential attainment, Placement rate, Income Mobility)"""
-    return pd.DataFrame([{
-        "NAME": county,
-        "year": year,
-        "metric": metric_name,
-        "value": None
-    } for county in ATLANTA_COUNTIES.keys()])
+# Metrics without APIs (Credential attainment, Placement rate, Income Mobility, ...)
+PLACEHOLDER_METRICS = ["median_wage", "annual_jobs", "k12_literacy", "credential_attainment",
+                       "placement_rate", "cost_of_living_index", "income_mobility_index"]
+
+def get_placeholder_metrics():
+    """One empty-value frame covering every (year, metric, county) combination"""
+    idx = pd.MultiIndex.from_product(
+        [YEARS, PLACEHOLDER_METRICS, ATLANTA_COUNTIES.keys()],
+        names=["year", "metric", "NAME"]
+    )
+    df = pd.DataFrame(index=idx).reset_index()
+    df["value"] = None
+    return df[["NAME", "year", "metric", "value"]]
 
 def combine_metrics():
     frames = []
-    for year in YEARS:
-        print(f"\n📡 Fetching data for {year}...")
-        # Poverty rate
-        pr = get_poverty_rate(year)
-        frames.append(pr)
-        # Unemployment rate
-        ur = get_unemployment_rate(year)
-        frames.append(ur)
-        # Placeholder metrics
-        for metric in ["median_wage", "annual_jobs", "k12_literacy", "credential_attainment",
-                       "placement_rate", "cost_of_living_index", "income_mobility_index"]:
-            frames.append(get_placeholder_metric(year, metric))
-    combined = pd.concat(frames, ignore_index=True)
+    # Unemployment rate: one batched call for all counties and years
+    print("\n📡 Fetching unemployment data (all years)...")
+    frames.append(get_unemployment_rate())
+    # Poverty rate: the per-year Census calls are independent network round
+    # trips, so fetch them concurrently (keep workers modest to stay under
+    # the Census rate limit; SESSION is thread-safe for distinct requests)
+    print("\n📡 Fetching poverty data (all years)...")
+    with ThreadPoolExecutor(max_workers=5) as ex:
+        poverty_futures = {year: ex.submit(get_poverty_rate, year) for year in YEARS}
+        for year in YEARS:
+            frames.append(poverty_futures[year].result())
+    # Placeholder metrics: one cartesian-product frame instead of a small
+    # DataFrame per (year, metric) pair
+    frames.append(get_placeholder_metrics())
+    combined = pd.concat(frames, ignore_index=True, copy=False)
     combined.to_csv("atlanta_metrics.csv", index=False)
     print("\n✅ Saved CSV → atlanta_metrics.csv")
     print(combined.head(10))
@@ -8,21 +8,35 @@ load_dotenv()
 MONGODB_URI = os.getenv("MONGODB_URI")
 DB_NAME = os.getenv("MONGODB_DB")
 
-# Connect to MongoDB
-client = MongoClient(MONGODB_URI)
+# Connect to MongoDB. w=1/journal=False acknowledges writes without waiting
+# on the journal fsync — fine for bulk metric ingestion — and maxPoolSize
+# covers concurrent loaders sharing the client.
+client = MongoClient(MONGODB_URI, w=1, journal=False, maxPoolSize=50)
 db = client[DB_NAME]
 
 # Test: list collections
 print("Connected to MongoDB!")
 print("Collections:", db.list_collection_names())
 
-# Optional: insert a test document
+# Optional: insert test documents. This is the pattern the CSV->Mongo
+# loaders should copy: batch documents (e.g. ~1000 per county/year chunk)
+# into one insert_many call — one round trip instead of one per document —
+# with ordered=False so independent rows don't block each other.
 test_collection = db["metrics"]
-result = test_collection.insert_one({
-    "county": "Fulton County",
-    "metric": "unemployment_rate",
-    "value": 3.4,
-    "period": "2024-09",
-    "last_updated": "2024-11-07"
-})
-print("Inserted document ID:", result.inserted_id)
+result = test_collection.insert_many([
+    {
+        "county": "Fulton County",
+        "metric": "unemployment_rate",
+        "value": 3.4,
+        "period": "2024-09",
+        "last_updated": "2024-11-07"
+    },
+    {
+        "county": "Fulton County",
+        "metric": "poverty_rate",
+        "value": 12.1,
+        "period": "2024-09",
+        "last_updated": "2024-11-07"
+    }
+], ordered=False)
+print("Inserted document IDs:", result.inserted_ids)
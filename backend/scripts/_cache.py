@@ -0,0 +1,57 @@
+"""
+Tiny SQLite-backed TTL cache for the CLI scripts.
+
+Stores JSON values under ~/.cache/mih/cache.db so repeated invocations of
+manage_notifications.py / update_kpi_values.py can skip round trips whose
+answer hasn't changed (auth probe, preference listings, history). Every
+entry carries an absolute expiry; reads of expired or missing keys return
+None. All failures degrade to "no cache" — the scripts must never break
+because the cache file is unwritable.
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "mih", "cache.db")
+
+
+def _connect():
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH)
+    conn.execute("CREATE TABLE IF NOT EXISTS cache (k TEXT PRIMARY KEY, v BLOB, exp REAL)")
+    return conn
+
+
+def get(key):
+    """Return the cached value for key, or None if missing/expired."""
+    try:
+        with _connect() as conn:
+            row = conn.execute("SELECT v, exp FROM cache WHERE k = ?", (key,)).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None or row[1] < time.time():
+        return None
+    return json.loads(row[0])
+
+
+def put(key, value, ttl):
+    """Store a JSON-serializable value under key for ttl seconds."""
+    try:
+        with _connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (k, v, exp) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl)
+            )
+    except sqlite3.Error:
+        pass
+
+
+def invalidate(prefix):
+    """Drop every entry whose key starts with prefix."""
+    try:
+        with _connect() as conn:
+            conn.execute("DELETE FROM cache WHERE k LIKE ?", (prefix + "%",))
+    except sqlite3.Error:
+        pass
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+One-shot migration: convert string last_notified values to real datetimes.
+
+The KPI monitor only writes datetime objects, and its cooldown filtering now
+happens inside the Mongo query, which requires last_notified to be a BSON
+date. Any legacy rows that stored ISO strings (e.g. "2024-11-07T10:00:00Z")
+must be converted once with this script.
+
+Usage:
+    python scripts/migrate_last_notified.py
+
+Requirements:
+    - MONGODB_URI and MONGODB_DB set in the environment or .env
+"""
+
+import os
+from datetime import datetime
+
+from pymongo import MongoClient, UpdateOne
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv("MONGODB_URI")
+DB_NAME = os.getenv("MONGODB_DB")
+
+
+def parse_iso(value: str) -> datetime:
+    """Parse an ISO timestamp, accepting a trailing 'Z' for UTC."""
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def migrate():
+    client = MongoClient(MONGODB_URI)
+    collection = client[DB_NAME]["notification_preferences"]
+
+    updates = []
+    skipped = 0
+    for doc in collection.find({"last_notified": {"$type": "string"}},
+                               {"last_notified": 1}):
+        try:
+            parsed = parse_iso(doc["last_notified"])
+        except ValueError:
+            print(f"⚠️  Could not parse last_notified for {doc['_id']}: {doc['last_notified']}")
+            skipped += 1
+            continue
+        updates.append(UpdateOne({"_id": doc["_id"]},
+                                 {"$set": {"last_notified": parsed}}))
+
+    if updates:
+        result = collection.bulk_write(updates, ordered=False)
+        print(f"✅ Converted {result.modified_count} preference(s) to datetime")
+    else:
+        print("✅ No string last_notified values found — nothing to migrate")
+
+    if skipped:
+        print(f"⚠️  Skipped {skipped} unparseable value(s)")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    migrate()